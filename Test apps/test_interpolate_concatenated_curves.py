@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+from main import interpolate_concatenated_curves
+
+
+def interpolate_one_by_one(log_x_target, log_xs, ys):
+    return np.array([np.interp(log_x_target, log_x, y, left=np.nan, right=np.nan)
+                     for log_x, y in zip(log_xs, ys)])
+
+
+def compare(xs, ys, x_target):
+    log_xs = [np.log(x) for x in xs]
+    i_starts = np.concatenate(([0], np.cumsum([len(x) for x in xs])))
+    log_x_target = np.log(x_target)
+
+    result = interpolate_concatenated_curves(log_x_target, np.concatenate(log_xs), np.concatenate(ys), i_starts)
+    expected = interpolate_one_by_one(log_x_target, log_xs, ys)
+    return result, expected
+
+
+def test_curve_starting_at_0_hz_leaves_other_rows_unchanged():
+    rng = np.random.default_rng(1)
+    good_xs = [np.sort(rng.uniform(20, 20000, 200)) for _ in range(3)]
+    good_ys = [rng.normal(size=200) for _ in range(3)]
+    x_with_0_hz = np.concatenate(([0.], np.linspace(1, 20000, 300)))
+    y_with_0_hz = rng.normal(size=301)
+    x_target = np.geomspace(10, 30000, 100)
+
+    with np.errstate(divide="ignore"):
+        result_good, _ = compare(good_xs, good_ys, x_target)
+        result_mixed, expected_mixed = compare([x_with_0_hz] + good_xs, [y_with_0_hz] + good_ys, x_target)
+
+    assert np.allclose(result_mixed, expected_mixed, equal_nan=True)
+    assert np.allclose(result_mixed[1:], result_good, equal_nan=True)
+    assert not np.isnan(result_mixed[0]).all()
+
+
+if __name__ == "__main__":
+    test_curve_starting_at_0_hz_leaves_other_rows_unchanged()
+    print("OK")
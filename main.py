@@ -33,17 +33,19 @@ from generictools.graphing_widget import MatplotlibWidget
 
 from generictools import signal_tools
 import generictools.personalized_widgets as pwi
-import pyperclip  # must install xclip on Linux together with this!!
-from functools import partial
-import matplotlib as mpl
+from functools import partial, lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from tabulate import tabulate
 from io import StringIO
 import pickle
+import struct
 import logging
+import logging.handlers
+import queue
 import time
 
 app_definitions = {"app_name": "Linecraft",
-                   "version": "0.2.4",
+                   "version": "0.2.5",
                    # "version": "Test build " + today.strftime("%Y.%m.%d"),
                    "description": "Linecraft - Frequency response plotting and statistics",
                    "copyright": "Copyright (C) 2024 Kerem Basaran",
@@ -55,6 +57,37 @@ app_definitions = {"app_name": "Linecraft",
                    }
 
 
+class SettingsWriter(qtc.QObject):
+    """Writes setting values to the registry. Lives in its own thread so the GUI does not wait on disk."""
+    signal_write = qtc.Signal(object)
+    signal_finish = qtc.Signal()
+
+    def __init__(self, organization: str, application: str):
+        super().__init__()
+        self._settings_sys_args = (organization, application)
+        self._settings_sys = None
+        self.signal_write.connect(self._write)
+        self.signal_finish.connect(self._finish)
+
+    def _get_settings_sys(self):
+        # created on first use so that it belongs to the writer thread
+        if self._settings_sys is None:
+            self._settings_sys = qtc.QSettings(*self._settings_sys_args)
+        return self._settings_sys
+
+    @qtc.Slot(object)
+    def _write(self, values: dict):
+        settings_sys = self._get_settings_sys()
+        for attr_name, value in values.items():
+            settings_sys.setValue(attr_name, value)
+        settings_sys.sync()  # one flush for the whole batch
+
+    @qtc.Slot()
+    def _finish(self):
+        # queued after all the writes, so everything is written when the thread quits
+        self.thread().quit()
+
+
 @dataclass
 class Settings:
     global logger
@@ -77,6 +110,7 @@ class Settings:
     max_legend_size: int = 10
     import_ppo: int = 96
     export_ppo: int = 96
+    save_state_fp32: bool = False
     processing_selected_tab: int = 0
     mean_selected: bool = False
     median_selected: bool = True
@@ -103,36 +137,77 @@ class Settings:
         settings_storage_title = self.app_name + " - " + (self.version.split(".")[0] if "." in self.version else "")
         self.settings_sys = qtc.QSettings(
             self.author_short, settings_storage_title)
+        self._dirty = set()  # names of the attributes changed since the last write to registry
+        # changes in quick succession are collected and written together once they settle
+        self._write_timer = qtc.QTimer()
+        self._write_timer.setSingleShot(True)
+        self._write_timer.setInterval(500)
+        self._write_timer.timeout.connect(self._write_changes)
+        self._writer = SettingsWriter(self.author_short, settings_storage_title)
+        self._writer_thread = qtc.QThread()
+        self._writer.moveToThread(self._writer_thread)
+        self._writer_thread.start()
+        self.settings_sys.sync()  # reload from the backend once, then read everything from memory
         self.read_all_from_registry()
 
     def update(self, attr_name, new_val):
-        if new_val is None:
-            return
-        elif type(getattr(self, attr_name)) != type(new_val):
-            logger.warning(f"Settings.update: Received value type {type(new_val)} does not match the original type {type(getattr(self, attr_name))}"
-                            f"\nValue: {new_val}")
-
-        setattr(self, attr_name, new_val)
-        self.settings_sys.setValue(attr_name, getattr(self, attr_name))
-
-    def write_all_to_registry(self):
-        for field in fields(self):
-            value = getattr(self, field.name)
+        self.update_many({attr_name: new_val})
+
+    def update_many(self, new_vals: dict):
+        for attr_name, new_val in new_vals.items():
+            if new_val is None:
+                continue
+            elif type(getattr(self, attr_name)) != type(new_val):
+                logger.warning(f"Settings.update: Received value type {type(new_val)} does not match the original type {type(getattr(self, attr_name))}"
+                                f"\nValue: {new_val}")
+            elif getattr(self, attr_name) == new_val:
+                continue
+
+            setattr(self, attr_name, new_val)
+            self._dirty.add(attr_name)
+
+        if self._dirty:
+            self._write_timer.start()
+
+    def snapshot(self, attr_names) -> dict:
+        values = vars(self)
+        return {attr_name: values[attr_name] for attr_name in attr_names}
+
+    def _write_changes(self):
+        # only the changed values are written. the rest are already the same in the registry.
+        values = {}
+        for attr_name in self._dirty:
+            value = getattr(self, attr_name)
             
             # convert tuples to list for Qt compatibility
             value = list(value) if isinstance(value, tuple) else value
 
-            self.settings_sys.setValue(field.name, value)
+            values[attr_name] = value
+        self._dirty.clear()
+
+        if values:
+            self._writer.signal_write.emit(values)
+
+    def close(self):
+        # write what is waiting and stop the writer thread once it is done
+        self._write_timer.stop()
+        self._write_changes()
+        self._writer.signal_finish.emit()
+        self._writer_thread.wait()
 
     def read_all_from_registry(self):
-        for field in fields(self):
-            try:
-                value_raw = self.settings_sys.value(field.name, field.default)
-                value = field.type(value_raw)
-            except (TypeError, ValueError):
-                value = field.default
+        stored_names = set(self.settings_sys.allKeys())  # one enumeration instead of a lookup for each missing name
+        for attr_name, attr_type in _FIELD_TYPES.items():
+            default = _FIELD_DEFAULTS[attr_name]
+            if attr_name not in stored_names:
+                value = default
+            else:
+                try:
+                    value = self.settings_sys.value(attr_name, default, type=attr_type)
+                except (TypeError, ValueError):
+                    value = default
     
-            setattr(self, field.name, value)
+            setattr(self, attr_name, value)
 
     def as_dict(self):
         settings = {}
@@ -143,6 +218,11 @@ class Settings:
     def __repr__(self):
         return str(self.as_dict())
 
+
+# ---- Type and default value of each setting. Collected once.
+_FIELD_TYPES = {field.name: field.type for field in fields(Settings)}
+_FIELD_DEFAULTS = {field.name: field.default for field in fields(Settings)}
+
 # Guide for special comments
 # https://docs.spyder-ide.org/current/panes/outline.html
 
@@ -186,6 +266,193 @@ def find_longest_match_in_name(names: list) -> str:
     return max_occurring_key
 
 
+@lru_cache(maxsize=1)
+def get_matplotlib_styles() -> tuple:
+    """Names of the available Matplotlib styles, excluding the private ones. Collected once."""
+    import matplotlib.style
+    return tuple(style_name for style_name in matplotlib.style.available if style_name[0] != "_")
+
+
+def interpolate_rows_to_ppo(x: np.ndarray, y_rows: np.ndarray, ppo: int, must_include_freq: int) -> tuple:
+    """
+    Interpolate multiple curves that share the same frequency array to a log spaced frequency array.
+    Each row goes through signal_tools.interpolate_to_ppo so results are the same as for single curve import
+    and export. The rows are collected into one preallocated 2D array.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Frequency array that is common to all the curves. Sorted, positive values.
+    y_rows : np.ndarray
+        2D array of curve values. Each row is a curve.
+    ppo : int
+        Points per octave of the target frequency array.
+    must_include_freq : int
+        Frequency that will always be a point within the target frequency array.
+
+    Returns
+    -------
+    x_intp : np.ndarray
+        Target frequency array.
+    y_intp_rows : np.ndarray
+        2D array of interpolated curve values. Each row is a curve.
+
+    """
+    x_intp, y_intp_first_row = signal_tools.interpolate_to_ppo(x, y_rows[0], ppo, must_include_freq)
+
+    y_intp_rows = np.empty((len(y_rows), len(x_intp)), dtype=float)
+    y_intp_rows[0] = y_intp_first_row
+    for i_row, y in enumerate(y_rows[1:], start=1):
+        y_intp_rows[i_row] = signal_tools.interpolate_to_ppo(x, y, ppo, must_include_freq)[1]
+
+    return x_intp, y_intp_rows
+
+
+def interpolate_concatenated_curves(log_x_target: np.ndarray, log_xs: np.ndarray, ys: np.ndarray,
+                                    i_starts: np.ndarray) -> np.ndarray:
+    """
+    Interpolate many curves, each with its own frequency array, to a common frequency array.
+    Curves are received placed end to end in single arrays and are interpolated with one np.interp call.
+
+    Parameters
+    ----------
+    log_x_target : np.ndarray
+        Natural logarithm of the target frequency array.
+    log_xs : np.ndarray
+        Natural logarithm of the frequencies of all curves.
+    ys : np.ndarray
+        Values of all curves.
+    i_starts : np.ndarray
+        Index in the arrays where each curve starts. Last item is the total length.
+
+    Returns
+    -------
+    y_intp_rows : np.ndarray
+        2D array of interpolated curve values. Each row is a curve.
+        Values outside the frequency range of a curve are NaN.
+
+    """
+    n_curves = len(i_starts) - 1
+    y_intp_rows = np.empty((n_curves, len(log_x_target)), dtype=float)
+
+    # a frequency of 0 Hz or below gives a non-finite logarithm. such curves cannot be shifted.
+    is_finite = np.isfinite(log_xs)
+    n_non_finite_until = np.concatenate(([0], np.cumsum(~is_finite)))
+    curve_is_finite = n_non_finite_until[i_starts[1:]] == n_non_finite_until[i_starts[:-1]]
+
+    # interpolate those one by one
+    for i_curve in np.flatnonzero(~curve_is_finite):
+        i_start, i_end = i_starts[i_curve], i_starts[i_curve + 1]
+        y_intp_rows[i_curve] = np.interp(log_x_target, log_xs[i_start:i_end], ys[i_start:i_end],
+                                         left=np.nan, right=np.nan)
+
+    i_curves = np.flatnonzero(curve_is_finite)
+    if i_curves.size == 0:
+        return y_intp_rows
+
+    # shift each curve in log frequency so that all curves follow each other without overlapping
+    finite_values = np.concatenate((log_xs[is_finite], log_x_target[np.isfinite(log_x_target)]))
+    span = finite_values.max() - finite_values.min() + 1
+    is_in_finite_curve = np.repeat(curve_is_finite, np.diff(i_starts))
+    log_xs_shifted = (log_xs + np.repeat(np.arange(n_curves) * span, np.diff(i_starts)))[is_in_finite_curve]
+    log_x_target_shifted = log_x_target + (i_curves * span)[:, None]
+
+    y_intp_finite = np.interp(log_x_target_shifted, log_xs_shifted, ys[is_in_finite_curve])
+
+    # outside its own frequency range a curve would be interpolated towards its neighbors
+    out_of_range = ((log_x_target < log_xs[i_starts[i_curves], None])
+                    | (log_x_target > log_xs[i_starts[i_curves + 1] - 1, None]))
+    y_intp_finite[out_of_range] = np.nan
+    y_intp_rows[i_curves] = y_intp_finite
+
+    return y_intp_rows
+
+
+# ---- Getter and setter for each kind of form widget. Combo boxes are accessed by index.
+_WIDGET_IO = {qtw.QCheckBox: (lambda widget: widget.isChecked(),
+                              lambda widget, value: widget.setChecked(value)),
+              qtw.QComboBox: (lambda widget: widget.currentIndex(),
+                              lambda widget, value: widget.setCurrentIndex(value)),
+              }
+_WIDGET_IO_DEFAULT = (lambda widget: widget.value(),
+                      lambda widget, value: widget.setValue(value))
+
+
+def get_widget_io(widget: qtw.QWidget) -> tuple:
+    """
+    Get the (getter, setter) pair for a form widget.
+    Looked up by the type of the widget. Subclasses are resolved once through their MRO and then cached.
+
+    """
+    widget_type = type(widget)
+    try:
+        return _WIDGET_IO[widget_type]
+    except KeyError:
+        widget_io = next((_WIDGET_IO[cls] for cls in widget_type.__mro__ if cls in _WIDGET_IO),
+                         _WIDGET_IO_DEFAULT)
+        _WIDGET_IO[widget_type] = widget_io
+        return widget_io
+
+
+def load_widget_values(widgets: dict, values: dict):
+    """Set the values of widgets from a dictionary with the same keys."""
+    for key, widget in widgets.items():
+        get_widget_io(widget)[1](widget, values[key])
+
+
+def read_widget_values(widgets: dict) -> dict:
+    """Read the values of widgets into a dictionary with the same keys."""
+    return {key: get_widget_io(widget)[0](widget) for key, widget in widgets.items()}
+
+
+# ---- State files start with this since 0.2.5. Files from 0.2.4 and earlier are a plain pickle.
+STATE_FILE_MAGIC = b"LCSTATE\x05"
+
+
+def write_state_file(f, state):
+    """
+    Write a state package to a file opened in binary mode.
+    Arrays are pickled out-of-band and written directly from their memory after a table of their sizes.
+    Then comes the pickle of the rest of the package. Each block starts at a multiple of 8 bytes.
+
+    """
+    buffers = []
+    pickled = pickle.dumps(state, protocol=5, buffer_callback=buffers.append)
+    buffers = [buffer.raw() for buffer in buffers]
+
+    header = STATE_FILE_MAGIC + struct.pack(f"<I{len(buffers)}Q", len(buffers), *(buffer.nbytes for buffer in buffers))
+    f.write(header + bytes(-len(header) % 8))
+    for buffer in buffers:
+        f.write(buffer)
+        f.write(bytes(-buffer.nbytes % 8))
+    f.write(pickled)
+
+
+def read_state_file(data: bytearray):
+    """
+    Read a state package from the contents of a state file.
+    Arrays in the package use the memory of data without a copy.
+
+    """
+    if data[:len(STATE_FILE_MAGIC)] != STATE_FILE_MAGIC:
+        return pickle.loads(data)  # saved with 0.2.4 or earlier
+
+    data = memoryview(data)
+    i = len(STATE_FILE_MAGIC)
+    n_buffers, = struct.unpack_from("<I", data, i)
+    i += 4
+    lengths = struct.unpack_from(f"<{n_buffers}Q", data, i)
+    i += 8 * n_buffers
+    i += -i % 8
+
+    buffers = []
+    for length in lengths:
+        buffers.append(data[i:i + length])
+        i += length + (-length % 8)
+
+    return pickle.loads(data[i:], buffers=buffers)
+
+
 class CurveAnalyze(qtw.QMainWindow):
     global settings, app_definitions, logger
 
@@ -230,6 +497,8 @@ class CurveAnalyze(qtw.QMainWindow):
     def _create_core_objects(self):
         self._interactable_widgets = dict()  # a dictionary of QWidgets that users interact with
         self.curves = []  # frequency response curves. THIS IS THE SINGLE SOURCE OF TRUTH FOR CURVE DATA.
+        self._curves_soa_cache = None  # all curves' data in contiguous arrays. see _get_curves_as_soa.
+        self._reference_curve = None  # the curve currently set as reference, if any
 
     def _create_menu_bar(self):
         menu_bar = self.menuBar()
@@ -279,6 +548,12 @@ class CurveAnalyze(qtw.QMainWindow):
         self.qlistwidget_for_curves = qtw.QListWidget()
         self.qlistwidget_for_curves.setSelectionMode(
             qtw.QAbstractItemView.ExtendedSelection)
+
+        # fonts for the list items of visible and hidden curves. created once and shared by all items.
+        self._font_normal = qtg.QFont(self.qlistwidget_for_curves.font())
+        self._font_normal.setWeight(qtg.QFont.Normal)
+        self._font_thin = qtg.QFont(self.qlistwidget_for_curves.font())
+        self._font_thin.setWeight(qtg.QFont.Thin)
         # self.qlistwidget_for_curves.setDragDropMode(qtw.QAbstractItemView.InternalMove)  # crashes the application
 
     def _place_widgets(self):
@@ -386,6 +661,7 @@ class CurveAnalyze(qtw.QMainWindow):
 
     def _get_curve_from_clipboard(self):
         """Read a signal_tools.Curve object from clipboard."""
+        import pyperclip  # must install xclip on Linux together with this!!
         data = pyperclip.paste()
         new_curve = signal_tools.Curve(data)
         if new_curve.is_curve():
@@ -445,9 +721,7 @@ class CurveAnalyze(qtw.QMainWindow):
             # update the QListWidget
             new_list_item = qtw.QListWidgetItem(curve.get_full_name())
             if not curve.is_visible():
-                font = new_list_item.font()
-                font.setWeight(qtg.QFont.Thin)
-                new_list_item.setFont(font)
+                new_list_item.setFont(self._font_thin)
 
             self.qlistwidget_for_curves.insertItem(i_after, new_list_item)
             self.qlistwidget_for_curves.takeItem(i_before + 1)
@@ -583,6 +857,8 @@ class CurveAnalyze(qtw.QMainWindow):
         for i in sorted(indexes_to_remove, reverse=True):
             self.qlistwidget_for_curves.takeItem(i)
             self.curves.pop(i)
+        # release the cached data of the removed curves. also a new curve could reuse the id of a removed one.
+        self._curves_soa_cache = None
 
         self.signal_remove_curves_request.emit(indexes_to_remove)
 
@@ -615,6 +891,7 @@ class CurveAnalyze(qtw.QMainWindow):
                 return
 
         elif source == "clipboard":
+            import pyperclip  # must install xclip on Linux together with this!!
             import_file = StringIO(pyperclip.paste())
 
         # ---- setup how to read it
@@ -700,21 +977,25 @@ class CurveAnalyze(qtw.QMainWindow):
         logger.info(df.info)
 
         # ---- put on the graph
-        for name, values in df.iterrows():
+        # read the table into arrays once instead of building a Series per row
+        freqs = df.columns.to_numpy(dtype=float)
+        values_all = df.to_numpy(dtype=float)
+        if settings.import_ppo > 0:
+            # all rows share the same frequencies, interpolate them together
+            freqs, values_all = interpolate_rows_to_ppo(
+                freqs, values_all,
+                settings.import_ppo,
+                settings.interpolate_must_contain_hz,
+            )
+
+        new_curves = []
+        for name, values in zip(df.index, values_all):
             logger.debug(f"Attempting to add xy data of index {name} as curve.")
-            curve = signal_tools.Curve((df.columns, values))
-            
-            if settings.import_ppo > 0:
-                x, y = curve.get_xy()
-                x_intp, y_intp = signal_tools.interpolate_to_ppo(
-                    x, y,
-                    settings.import_ppo,
-                    settings.interpolate_must_contain_hz,
-                )
-                curve.set_xy((x_intp, y_intp))
-            
+            curve = signal_tools.Curve((freqs, values))
             curve.set_name_base(name)
-            _ = self._add_single_curve(None, curve, update_figure=False)
+            new_curves.append(curve)
+
+        _ = self._add_multiple_curves(None, new_curves)
 
         logger.info(f"Import of curves finished in {(time.perf_counter()-start_time)*1000:.4g}ms")
         self.graph.update_figure()
@@ -727,7 +1008,8 @@ class CurveAnalyze(qtw.QMainWindow):
                 self.import_single_curve)
             self.auto_importer.start()
         else:
-            self.auto_importer.requestInterruption()
+            self.auto_importer.stop()
+            self.auto_importer.deleteLater()
 
     def reference_curve_status_toggle(self, checked: bool):
         """
@@ -745,6 +1027,7 @@ class CurveAnalyze(qtw.QMainWindow):
                 # mark it as reference
                 curve.add_name_suffix("reference")
                 curve.set_reference(True)
+                self._reference_curve = curve
 
                 # Update the names in qlist widget
                 reference_item = self.qlistwidget_for_curves.item(index)
@@ -760,15 +1043,13 @@ class CurveAnalyze(qtw.QMainWindow):
 
         elif not checked:
             # find back the reference curve
-            reference_curves = [(index, curve) for index, curve in enumerate(
-                self.curves) if curve.is_reference()]
-            if len(reference_curves) == 0:
-                pass
-            elif len(reference_curves) > 1:
-                raise ValueError(
-                    "Multiple reference curves are in the list somehow..")
-            else:
-                index, curve = reference_curves[0]
+            # the curve object is stored instead of its index since indexes shift when curves are moved or removed
+            curve, self._reference_curve = self._reference_curve, None
+            # None if there is no reference or if the reference curve was removed from the list
+            index = next((i for i, listed_curve in enumerate(self.curves) if listed_curve is curve), None)
+
+            if index is not None:
+                assert curve.is_reference()
 
                 # revert it
                 curve.remove_name_suffix("reference")
@@ -784,45 +1065,81 @@ class CurveAnalyze(qtw.QMainWindow):
     def _add_single_curve(self, i_insert: int, curve: signal_tools.Curve, update_figure: bool = True,
                           line2d_kwargs={},
                           ):
-        if curve.is_curve():
-            i_max = len(self.curves)
-            if i_insert is None or i_insert >= i_max:
-                # do an add
+        return self._add_multiple_curves(i_insert, [curve], update_figure=update_figure, line2d_kwargs=line2d_kwargs)
+
+    def _add_multiple_curves(self, i_insert: int, curves: list, update_figure: bool = False,
+                             line2d_kwargs={},
+                             ) -> int:
+        """
+        Add or insert a list of curves in one go.
+        Figure is updated only with the last curve and only if requested.
+        Returns the index of the first curve added.
+        """
+        if not all(curve.is_curve() for curve in curves):
+            raise ValueError("Invalid curve")
+
+        i_max = len(self.curves)
+        if i_insert is None or i_insert >= i_max:
+            # do an add
+            i_insert = i_max
+            for i_curve, curve in enumerate(curves):
                 if not curve.has_name_prefix():
-                    curve.set_name_prefix(f"#{i_max:02d}")
-                self.curves.append(curve)
-
-                list_item = qtw.QListWidgetItem(curve.get_full_name())
-                if not curve.is_visible():
-                    font = list_item.font()
-                    font.setWeight(qtg.QFont.Thin)
-                    list_item.setFont(font)
-                self.qlistwidget_for_curves.addItem(list_item)
-
-                self.graph.add_line2d(i_max, curve.get_full_name(), curve.get_xy(),
-                                      update_figure=update_figure, line2d_kwargs=line2d_kwargs,
-                                      )
+                    curve.set_name_prefix(f"#{i_max + i_curve:02d}")
+        else:
+            # do an insert. prefixes are the same as inserting one by one starting from the last curve.
+            for i_curve, curve in enumerate(reversed(curves)):
+                curve.set_name_prefix(f"#{i_max + i_curve:02d}")
 
-                return i_max
+        self.curves[i_insert:i_insert] = curves
 
-            else:
-                # do an insert
-                curve.set_name_prefix(f"#{i_max:02d}")
-                self.curves.insert(i_insert, curve)
+        # add all list items with a single relayout of the list widget
+        self.qlistwidget_for_curves.setUpdatesEnabled(False)
+        self.qlistwidget_for_curves.insertItems(i_insert, [curve.get_full_name() for curve in curves])
+        for i_curve, curve in enumerate(curves):
+            if not curve.is_visible():
+                list_item = self.qlistwidget_for_curves.item(i_insert + i_curve)
+                list_item.setFont(self._font_thin)
+        self.qlistwidget_for_curves.setUpdatesEnabled(True)
 
-                list_item = qtw.QListWidgetItem(curve.get_full_name())
-                if not curve.is_visible():
-                    font = list_item.font()
-                    font.setWeight(qtg.QFont.Thin)
-                    list_item.setFont(font)
-                self.qlistwidget_for_curves.insertItem(i_insert, list_item)
+        for i_curve, curve in enumerate(curves):
+            self.graph.add_line2d(i_insert + i_curve, curve.get_full_name(), curve.get_xy(),
+                                  update_figure=update_figure and i_curve == len(curves) - 1,
+                                  line2d_kwargs=line2d_kwargs,
+                                  )
 
-                self.graph.add_line2d(i_insert, curve.get_full_name(), curve.get_xy(
-                ), update_figure=update_figure, line2d_kwargs=line2d_kwargs)
+        return i_insert
 
-                return i_insert
-        else:
-            raise ValueError("Invalid curve")
+    def _get_curves_as_soa(self) -> tuple:
+        """
+        Get the data of all curves in contiguous arrays, curves placed end to end.
+        Arrays are built again only when self.curves has changed since the last call.
+
+        Returns
+        -------
+        log_xs : np.ndarray
+            Natural logarithm of the frequencies of all curves.
+        ys : np.ndarray
+            Values of all curves.
+        i_starts : np.ndarray
+            Index in the arrays where each curve starts. Last item is the total length.
+
+        """
+        cache = self._curves_soa_cache
+        curve_ids = tuple(id(curve) for curve in self.curves)  # ids only, the cache does not keep curves alive
+        if cache is None or cache[0] != curve_ids:
+            xs = [curve.get_x() for curve in self.curves]
+            ys = [curve.get_y() for curve in self.curves]
+            i_starts = np.cumsum([0] + [len(x) for x in xs])
+            with np.errstate(divide="ignore"):  # 0 Hz points give -inf, handled in interpolate_concatenated_curves
+                log_xs = np.log(np.concatenate(xs, dtype=float)) if xs else np.empty(0)
+            cache = (curve_ids,
+                     log_xs,
+                     np.concatenate(ys, dtype=float) if ys else np.empty(0),
+                     i_starts,
+                     )
+            self._curves_soa_cache = cache
+
+        return cache[1:]
 
     def hide_curves(self, indexes: list = None):
         if isinstance(indexes, (list, np.ndarray)):
@@ -832,12 +1149,12 @@ class CurveAnalyze(qtw.QMainWindow):
         else:
             indexes_and_curves = self.get_selected_curves(as_dict=True)
 
+        self.qlistwidget_for_curves.setUpdatesEnabled(False)
         for index, curve in indexes_and_curves.items():
             item = self.qlistwidget_for_curves.item(index)
-            font = item.font()
-            font.setWeight(qtg.QFont.Thin)
-            item.setFont(font)
+            item.setFont(self._font_thin)
             curve.set_visible(False)
+        self.qlistwidget_for_curves.setUpdatesEnabled(True)
 
         self.update_visibilities_of_graph_curves(indexes_and_curves)
 
@@ -849,13 +1166,12 @@ class CurveAnalyze(qtw.QMainWindow):
         else:
             indexes_and_curves = self.get_selected_curves(as_dict=True)
 
+        self.qlistwidget_for_curves.setUpdatesEnabled(False)
         for index, curve in indexes_and_curves.items():
             item = self.qlistwidget_for_curves.item(index)
-            font = item.font()
-            font.setWeight(qtg.QFont.Normal)
-            item.setFont(font)
-
+            item.setFont(self._font_normal)
             curve.set_visible(True)
+        self.qlistwidget_for_curves.setUpdatesEnabled(True)
 
         self.update_visibilities_of_graph_curves(indexes_and_curves)
 
@@ -876,28 +1192,31 @@ class CurveAnalyze(qtw.QMainWindow):
         if self.return_false_and_beep_if_no_curve_selected():
             return
 
-        processing_dialog = ProcessingDialog(parent=self)
+        processing_functions = {"statistics": self._mean_and_median_analysis,
+                                "smoothing": self._smoothen_curves,
+                                "outliers": self._outlier_detection,
+                                "interpolation": self._interpolate_curves,
+                                "best_fit": self._show_best_fits,
+                                }
+        processing_dialog = ProcessingDialog(processing_functions, parent=self)
         processing_dialog.signal_processing_request.connect(self._processing_dialog_return)
         processing_dialog.exec()
 
-    def _processing_dialog_return(self, processing_function_name):
-        results = getattr(self, processing_function_name)()
+    def _processing_dialog_return(self, processing_function):
+        results = processing_function()
         to_beep = False
 
         if "to_insert" in results.keys():
             # sort the dict by highest key value first
             for i_to_insert, curves in sorted(results["to_insert"].items(), reverse=True):
-                if isinstance(curves, (list, tuple)):
-                    for curve in reversed(curves):
-                        _ = self._add_single_curve(
-                            i_to_insert, curve, update_figure=False, line2d_kwargs=results["line2d_kwargs"])
-                elif isinstance(curves, signal_tools.Curve):
-                    curve = curves
-                    _ = self._add_single_curve(
-                        i_to_insert, curve, update_figure=False, line2d_kwargs=results["line2d_kwargs"])
-                else:
+                if isinstance(curves, signal_tools.Curve):
+                    curves = [curves]
+                elif not isinstance(curves, (list, tuple)):
                     raise TypeError(f"Invalid data type to insert: {type(curves)}")
 
+                _ = self._add_multiple_curves(
+                    i_to_insert, list(curves), line2d_kwargs=results["line2d_kwargs"])
+
             self.graph.update_figure()
             to_beep = True
 
@@ -997,63 +1316,70 @@ class CurveAnalyze(qtw.QMainWindow):
                 )
 
             # ---- Calculate residuals squared
-            residuals_squared = {curve.get_full_name():
-                                (np.interp(np.log(ref_freqs), np.log(curve.get_x()), curve.get_y(),
-                                 left=np.nan, right=np.nan) - ref_curve_interpolated)**2
-                                for curve in self.curves}
-
-            df = pd.DataFrame.from_dict(residuals_squared,
-                                        orient='index',
-                                        columns=ref_freqs,
-                                        dtype=float,
-                                        )  # residuals squared. table is per frequency, per speaker.
+            log_ref_freqs = np.log(ref_freqs)
+            residuals_squared = interpolate_concatenated_curves(log_ref_freqs, *self._get_curves_as_soa())
+            residuals_squared -= ref_curve_interpolated
+            np.square(residuals_squared, out=residuals_squared)
 
             # ---- Apply weighting to residuals_squared
-            critical_columns = [column for column in df.columns if column >=
-                                settings.best_fit_critical_range_start_freq and column < settings.best_fit_critical_range_end_freq]
-            if critical_columns:
-                weighing_normalizer = (len(df.columns) + len(critical_columns) *
-                                       (settings.best_fit_critical_range_weight - 1)) / len(df.columns)
-                weighing_critical = settings.best_fit_critical_range_weight / weighing_normalizer
-                df[critical_columns].apply(lambda x: x * weighing_critical)
-                df = df / weighing_normalizer  # residuals squared, weighted. table is per frequency, per speaker.
+            is_critical = ((ref_freqs >= settings.best_fit_critical_range_start_freq)
+                           & (ref_freqs < settings.best_fit_critical_range_end_freq))
+            n_critical = np.count_nonzero(is_critical)
+            if n_critical:
+                weighing_normalizer = (len(ref_freqs) + n_critical *
+                                       (settings.best_fit_critical_range_weight - 1)) / len(ref_freqs)
+                residuals_squared[:, is_critical] *= settings.best_fit_critical_range_weight
+                residuals_squared /= weighing_normalizer  # residuals squared, weighted. table is per frequency, per speaker.
 
             else:
                 logger.warning(
                     "Critical frequency range does not contain any of the frequency points used in best fit")
 
             # --- Calculate standard deviation of weighted residuals
-            df.loc[:, "Unbiased variance of weighted residuals"] = df.sum(axis=1, skipna=True) / (len(df.columns) - 1)
-            df.loc[:, "Standard deviation of weighted residuals"] = df.loc[:, "Unbiased variance of weighted residuals"]**0.5
-            df.sort_values(by=["Standard deviation of weighted residuals"], ascending=True, inplace=True)
+            variances = np.nansum(residuals_squared, axis=1) / (len(ref_freqs) - 1)  # unbiased variance of weighted residuals
+            standard_deviations = variances**0.5
+            names_and_deviations = sorted(zip([curve.get_full_name() for curve in self.curves], standard_deviations),
+                                          key=lambda name_and_deviation: name_and_deviation[1],
+                                          )
 
             # ---- Generate screen text
-            result_text = "-- Standard deviation of weighted residual error (Swr) --"
-            result_text += f"\nReference: {ref_curve.get_name_prefix()}    Amount of frequency points: {len(ref_freqs)}"
-            result_text += "\n\n"
-            result_text += tabulate(df[["Standard deviation of weighted residuals"]], headers=("Item name", "Swr"))
+            result_text = "\n".join([
+                "-- Standard deviation of weighted residual error (Swr) --",
+                f"Reference: {ref_curve.get_name_prefix()}    Amount of frequency points: {len(ref_freqs)}",
+                "",
+                tabulate(names_and_deviations, headers=("Item name", "Swr")),
+            ])
 
         return {"title": "Best fits", "result_text": result_text}
 
     def _interpolate_curves(self):
         selected_curves = self.get_selected_curves(as_dict=True)
 
+        # group the curves that share the same frequency array. each group is interpolated in one go.
+        groups = {}
+        for i_curve, curve in selected_curves.items():
+            x = np.asarray(curve.get_x(), dtype=float)
+            groups.setdefault(x.tobytes(), (x, []))[1].append(i_curve)
+
         result_curves = {}
 
-        for i_curve, curve in selected_curves.items():
-            xy = signal_tools.interpolate_to_ppo(
-                *curve.get_xy(),
+        for x, i_curves in groups.values():
+            x_intp, y_intp_rows = interpolate_rows_to_ppo(
+                x,
+                np.array([selected_curves[i_curve].get_y() for i_curve in i_curves], dtype=float),
                 settings.processing_interpolation_ppo,
                 settings.interpolate_must_contain_hz,
                 )
 
-            new_curve = signal_tools.Curve(xy)
-            new_curve.set_name_base(curve.get_name_base())
-            for suffix in curve.get_name_suffixes():
-                new_curve.add_name_suffix(suffix)
-            new_curve.add_name_suffix(
-                f"interpolated to {settings.processing_interpolation_ppo} ppo")
-            result_curves[i_curve + 1] = new_curve
+            for i_curve, y_intp in zip(i_curves, y_intp_rows):
+                curve = selected_curves[i_curve]
+                new_curve = signal_tools.Curve((x_intp, y_intp))
+                new_curve.set_name_base(curve.get_name_base())
+                for suffix in curve.get_name_suffixes():
+                    new_curve.add_name_suffix(suffix)
+                new_curve.add_name_suffix(
+                    f"interpolated to {settings.processing_interpolation_ppo} ppo")
+                result_curves[i_curve + 1] = new_curve
 
         line2d_kwargs = {"color": "k", "linestyle": "-"}
 
@@ -1062,39 +1388,47 @@ class CurveAnalyze(qtw.QMainWindow):
     def _smoothen_curves(self):
         selected_curves = self.get_selected_curves(as_dict=True)
 
-        result_curves = {}
+        if settings.smoothing_type == 0:
+            smoothing_function = partial(signal_tools.smooth_log_spaced_curve_butterworth_fast,
+                                         bandwidth=settings.smoothing_bandwidth,
+                                         resolution=settings.smoothing_resolution_ppo,
+                                         order=8,
+                                         )
+
+        elif settings.smoothing_type == 1:
+            smoothing_function = partial(signal_tools.smooth_log_spaced_curve_butterworth_fast,
+                                         bandwidth=settings.smoothing_bandwidth,
+                                         resolution=settings.smoothing_resolution_ppo,
+                                         order=4,
+                                         )
+
+        elif settings.smoothing_type == 2:
+            smoothing_function = partial(signal_tools.smooth_curve_rectangular_no_interpolation,
+                                         bandwidth=settings.smoothing_bandwidth,
+                                         )
+
+        elif settings.smoothing_type == 3:
+            smoothing_function = partial(signal_tools.smooth_curve_gaussian,
+                                         bandwidth=settings.smoothing_bandwidth,
+                                         resolution=settings.smoothing_resolution_ppo,
+                                         )
 
-        for i_curve, curve in selected_curves.items():
-
-            if settings.smoothing_type == 0:
-                xy = signal_tools.smooth_log_spaced_curve_butterworth_fast(*curve.get_xy(),
-                                                                           bandwidth=settings.smoothing_bandwidth,
-                                                                           resolution=settings.smoothing_resolution_ppo,
-                                                                           order=8,
-                                                                           )
-
-            elif settings.smoothing_type == 1:
-                xy = signal_tools.smooth_log_spaced_curve_butterworth_fast(*curve.get_xy(),
-                                                                           bandwidth=settings.smoothing_bandwidth,
-                                                                           resolution=settings.smoothing_resolution_ppo,
-                                                                           order=4,
-                                                                           )
-
-            elif settings.smoothing_type == 2:
-                xy = signal_tools.smooth_curve_rectangular_no_interpolation(*curve.get_xy(),
-                                                                            bandwidth=settings.smoothing_bandwidth,
-                                                                            )
-
-            elif settings.smoothing_type == 3:
-                xy = signal_tools.smooth_curve_gaussian(*curve.get_xy(),
-                                                        bandwidth=settings.smoothing_bandwidth,
-                                                        resolution=settings.smoothing_resolution_ppo,
-                                                        )
+        else:
+            raise NotImplementedError(
+                "This smoothing type is not available")
+
+        # curves are independent and smoothing does not touch any Qt objects
+        # only the Butterworth and Gaussian types are run in threads. rectangular smoothing runs one by one.
+        if settings.smoothing_type in (0, 1, 3):
+            with ThreadPoolExecutor() as executor:
+                xys = list(executor.map(lambda curve: smoothing_function(*curve.get_xy()),
+                                        selected_curves.values()))
+        else:
+            xys = [smoothing_function(*curve.get_xy()) for curve in selected_curves.values()]
 
-            else:
-                raise NotImplementedError(
-                    "This smoothing type is not available")
+        result_curves = {}
 
+        for (i_curve, curve), xy in zip(selected_curves.items(), xys):
             new_curve = signal_tools.Curve(xy)
             new_curve.set_name_base(curve.get_name_base())
             for suffix in curve.get_name_suffixes():
@@ -1185,22 +1519,43 @@ class CurveAnalyze(qtw.QMainWindow):
         def collect_curve_info(curve):
             curve_info = {"visible": curve.is_visible(),
                           "identification": curve._identification,
-                          "x": tuple(curve.get_x()),
-                          "y": tuple(curve.get_y()),
+                          "length": len(curve.get_x()),
                           }
             return curve_info
 
         lines_info = []
         curves_info = []
+        xs, ys = [], []
         for line, curve in zip(self.graph.get_lines_in_user_defined_order(), self.curves):
             lines_info.append(collect_line2d_info(line))
             curves_info.append(collect_curve_info(curve))
-
-        package = pickle.dumps((graph_info, lines_info, curves_info), protocol=5)
-        return package
-
-    def set_widget_state(self, package):
-        graph_info, lines_info, curves_info = pickle.loads(package)
+            xs.append(curve.get_x())
+            ys.append(curve.get_y())
+
+        # x and y values of all curves are stored end to end in two arrays
+        # each curve is sliced back out using the "length" in its curve info
+        # frequencies always stay float64 so that they keep matching the frequency points of other curves
+        y_dtype = np.float32 if settings.save_state_fp32 else np.float64
+        curves_data = {"x": np.concatenate(xs, dtype=np.float64) if xs else np.empty(0, dtype=np.float64),
+                       "y": np.concatenate(ys, dtype=y_dtype) if ys else np.empty(0, dtype=y_dtype),
+                       }
+
+        return graph_info, lines_info, curves_info, curves_data
+
+    def set_widget_state(self, state):
+        graph_info, lines_info, curves_info, *curves_data = state
+        self._curves_soa_cache = None
+
+        if curves_data:
+            curves_data = curves_data[0]
+            i_splits = np.cumsum([curve_info["length"] for curve_info in curves_info])[:-1]
+            # calculations are always in float64, also when the state was saved in float32
+            xs = np.asarray(curves_data["x"], dtype=np.float64)
+            ys = np.asarray(curves_data["y"], dtype=np.float64)
+            xys = zip(np.split(xs, i_splits), np.split(ys, i_splits))
+        else:
+            # save files from 0.2.4 and earlier keep x and y as tuples in the curve info
+            xys = ((curve_info["x"], curve_info["y"]) for curve_info in curves_info)
 
         # ---- delete all lines first
         # self.remove_curves([*range(len(self.curves))])
@@ -1218,8 +1573,8 @@ class CurveAnalyze(qtw.QMainWindow):
                 ax.set_ylim(graph_info["ylim"])
 
         # ---- add lines
-        for line_info, curve_info in zip(lines_info, curves_info):
-            curve = signal_tools.Curve((curve_info["x"], curve_info["y"]))
+        for line_info, curve_info, xy in zip(lines_info, curves_info, xys):
+            curve = signal_tools.Curve(xy)
             curve.set_visible(curve_info["visible"])
             curve._identification = curve_info["identification"]
 
@@ -1250,9 +1605,8 @@ class CurveAnalyze(qtw.QMainWindow):
             raise NotADirectoryError(file_raw)
 
         settings.update("last_used_folder", str(file.parent))
-        package = self.get_widget_state()
         with open(file, "wb") as f:
-            f.write(package)
+            write_state_file(f, self.get_widget_state())
         self.signal_good_beep.emit()
 
     def pick_a_file_and_load_state_from_it(self):
@@ -1273,16 +1627,19 @@ class CurveAnalyze(qtw.QMainWindow):
             raise FileNotFoundError(file)
 
         settings.update("last_used_folder", str(file.parent))
+        # read the file into one buffer. the curve arrays are unpickled as views into it.
+        data = bytearray(file.stat().st_size)
         with open(file, "rb") as f:
-            self.set_widget_state(f.read())
+            f.readinto(data)
+        self.set_widget_state(read_state_file(data))
         self.signal_good_beep.emit()
 
 
 class ProcessingDialog(qtw.QDialog):
     global settings
-    signal_processing_request = qtc.Signal(str)
+    signal_processing_request = qtc.Signal(object)  # the processing function to run
 
-    def __init__(self, parent=None):
+    def __init__(self, processing_functions: dict, parent=None):
         super().__init__(parent=parent)
         self.setWindowModality(qtc.Qt.WindowModality.ApplicationModal)
         self.setWindowTitle("Processing Menu")
@@ -1290,193 +1647,204 @@ class ProcessingDialog(qtw.QDialog):
         self.tab_widget = qtw.QTabWidget()
         layout.addWidget(self.tab_widget)
 
-        # dict of tuples. key is index of tab. value is tuple with (UserForm, name of function to use for its calculation)
-        self.user_forms_and_recipient_functions = {}
+        # lists indexed by the tab index
+        self._user_forms = []  # UserForm of each tab. None until the tab is shown for the first time.
+        self._user_form_builders = []  # methods that create the UserForm of each tab
+        self._processing_functions = []  # function to use for the calculation of each tab
+
+        for tab_title, user_form_builder, processing_function in (
+                ("Statistics", self._create_statistics_form, processing_functions["statistics"]),
+                ("Smoothing", self._create_smoothing_form, processing_functions["smoothing"]),
+                ("Outliers", self._create_outliers_form, processing_functions["outliers"]),
+                ("Interpolation", self._create_interpolation_form, processing_functions["interpolation"]),
+                ("Best fit to current", self._create_best_fit_form, processing_functions["best_fit"]),
+                ):
+            # tab page is an empty container until its UserForm is built
+            tab_page = qtw.QWidget()
+            qtw.QVBoxLayout(tab_page).setContentsMargins(0, 0, 0, 0)
+            self.tab_widget.addTab(tab_page, tab_title)
+            self._user_forms.append(None)
+            self._user_form_builders.append(user_form_builder)
+            self._processing_functions.append(processing_function)
+
+        # ---- Common buttons for the dialog
+        button_group = pwi.PushButtonGroup({"run": "Run",
+                                            "cancel": "Cancel",
+                                            },
+                                           {},
+                                           )
+        button_group.buttons()["run_pushbutton"].setDefault(True)
+        layout.addWidget(button_group)
+
+        # ---- Build the tab that is shown. Others are built when they are first selected.
+        self.tab_widget.currentChanged.connect(self._build_tab)
+        self.tab_widget.setCurrentIndex(settings.processing_selected_tab)
+        self._build_tab(self.tab_widget.currentIndex())
+
+        # ---- Connections
+        button_group.buttons()["cancel_pushbutton"].clicked.connect(
+            self.reject)
+        button_group.buttons()["run_pushbutton"].clicked.connect(
+            self._save_and_close)
+
+    def _build_tab(self, i):
+        if self._user_forms[i] is not None:
+            return  # already built
+
+        user_form = self._user_form_builders[i]()
+
+        # ---- Update parameters from settings
+        load_widget_values(user_form.interactable_widgets,
+                           settings.snapshot(user_form.interactable_widgets.keys()),
+                           )
+
+        self.tab_widget.widget(i).layout().addWidget(user_form)
+        self._user_forms[i] = user_form
 
+    def _create_statistics_form(self):
         # ---- Statistics page
-        user_form_0 = pwi.UserForm()
-        # tab page is the UserForm widget
-        self.tab_widget.addTab(user_form_0, "Statistics")
-        i = self.tab_widget.indexOf(user_form_0)
-        self.user_forms_and_recipient_functions[i] = (
-            user_form_0, "_mean_and_median_analysis")
-
-        user_form_0.add_row(pwi.CheckBox("mean_selected",
-                                         "Returns a curve showing the mean value of level in dB."
-                                         "Preferred method of estimating representtive curve when sample population is small and symmetrically distributed.",
-                                         ),
-                            "Calculate mean",
-                            )
+        user_form = pwi.UserForm()
 
-        user_form_0.add_row(pwi.CheckBox("median_selected",
-                                         "Returns a curve showing the median value per frequency point."
-                                         "Preferred method of estimating representtive curve when sample population is large and/or skewed.",
-                                         ),
-                            "Calculate median",
-                            )
+        user_form.add_row(pwi.CheckBox("mean_selected",
+                                       "Returns a curve showing the mean value of level in dB."
+                                       "Preferred method of estimating representtive curve when sample population is small and symmetrically distributed.",
+                                       ),
+                          "Calculate mean",
+                          )
 
+        user_form.add_row(pwi.CheckBox("median_selected",
+                                       "Returns a curve showing the median value per frequency point."
+                                       "Preferred method of estimating representtive curve when sample population is large and/or skewed.",
+                                       ),
+                          "Calculate median",
+                          )
+
+        return user_form
+
+    def _create_smoothing_form(self):
         # ---- Smoothing page
-        user_form_1 = pwi.UserForm()
-        # tab page is the UserForm widget
-        self.tab_widget.addTab(user_form_1, "Smoothing")
-        i = self.tab_widget.indexOf(user_form_1)
-        self.user_forms_and_recipient_functions[i] = (
-            user_form_1, "_smoothen_curves")
-
-        user_form_1.add_row(pwi.ComboBox("smoothing_type",
-                                         None,
-                                         [("Butterworth 8th, log spaced",),
-                                          ("Butterworth 4th, log spaced",),
-                                          ("Rectangular, w/o interpolation",),
-                                          ("Gaussian, log spaced",),
-                                          ]
-                                         ),
-                            "Type",
-                            )
-        # user_form_1.interactable_widgets["smoothing_type"].model().item(1).setEnabled(False)  # disable Klippel
+        user_form = pwi.UserForm()
 
-        user_form_1.add_row(pwi.IntSpinBox("smoothing_resolution_ppo",
-                                           "Parts per octave resolution for the operation",
-                                           min_max=(1, 99999),
-                                           ),
-                            "Resolution (ppo)",
-                            )
-        user_form_1.add_row(pwi.IntSpinBox("smoothing_bandwidth",
-                                           "Width of the frequency band in 1/octave."
-                                           "\nFor Gaussion, bandwidth defines 2x the standard deviation of distribution."
-                                           "\nFor Butterworth, bandwidth is the distance between critical frequencies, i.e. -3dB points for a first order filter.",
-                                           min_max=(1, 99999),
-                                           ),
-                            "Bandwidth (1/octave)",
-                            )
+        user_form.add_row(pwi.ComboBox("smoothing_type",
+                                       None,
+                                       [("Butterworth 8th, log spaced",),
+                                        ("Butterworth 4th, log spaced",),
+                                        ("Rectangular, w/o interpolation",),
+                                        ("Gaussian, log spaced",),
+                                        ]
+                                       ),
+                          "Type",
+                          )
+        # user_form.interactable_widgets["smoothing_type"].model().item(1).setEnabled(False)  # disable Klippel
+
+        user_form.add_row(pwi.IntSpinBox("smoothing_resolution_ppo",
+                                         "Parts per octave resolution for the operation",
+                                         min_max=(1, 99999),
+                                         ),
+                          "Resolution (ppo)",
+                          )
+        user_form.add_row(pwi.IntSpinBox("smoothing_bandwidth",
+                                         "Width of the frequency band in 1/octave."
+                                         "\nFor Gaussion, bandwidth defines 2x the standard deviation of distribution."
+                                         "\nFor Butterworth, bandwidth is the distance between critical frequencies, i.e. -3dB points for a first order filter.",
+                                         min_max=(1, 99999),
+                                         ),
+                          "Bandwidth (1/octave)",
+                          )
 
         def set_availability_of_resolution_option(smoothing_type_index):
             available = True if smoothing_type_index in (0, 1, 3) else False
-            user_form_1.interactable_widgets["smoothing_resolution_ppo"].setEnabled(
+            user_form.interactable_widgets["smoothing_resolution_ppo"].setEnabled(
                 available)
 
-        user_form_1.interactable_widgets["smoothing_type"].currentIndexChanged.connect(
+        user_form.interactable_widgets["smoothing_type"].currentIndexChanged.connect(
             set_availability_of_resolution_option)
 
+        return user_form
+
+    def _create_outliers_form(self):
         # ---- Outlier detection page
-        user_form_2 = pwi.UserForm()
-        # tab page is the UserForm widget
-        self.tab_widget.addTab(user_form_2, "Outliers")
-        i = self.tab_widget.indexOf(user_form_2)
-        self.user_forms_and_recipient_functions[i] = (
-            user_form_2, "_outlier_detection")
-
-        user_form_2.add_row(pwi.FloatSpinBox("outlier_fence_iqr",
-                                             "Fence post for outlier detection using IQR method. Unit is the interquartile range of the data points for given frequency.",
-                                             decimals=1,
-                                             min_max=(1, 99999),
-                                             ),
-                            "Outlier fence (IQR)",
-                            )
-
-        user_form_2.add_row(pwi.ComboBox("outlier_action",
-                                         "Action to carry out on curves that fall partly or fully outside the fence.",
-                                         [("None",),
-                                          ("Hide",),
-                                          ("Remove",),
-                                          ]
-                                         ),
-                            "Action on outliers",
-                            )
+        user_form = pwi.UserForm()
 
-        # ---- Interpolation page
-        user_form_3 = pwi.UserForm()
-        # tab page is the UserForm widget
-        self.tab_widget.addTab(user_form_3, "Interpolation")
-        i = self.tab_widget.indexOf(user_form_3)
-        self.user_forms_and_recipient_functions[i] = (
-            user_form_3, "_interpolate_curves")
-
-        user_form_3.add_row(pwi.IntSpinBox("processing_interpolation_ppo",
-                                           None,
+        user_form.add_row(pwi.FloatSpinBox("outlier_fence_iqr",
+                                           "Fence post for outlier detection using IQR method. Unit is the interquartile range of the data points for given frequency.",
+                                           decimals=1,
                                            min_max=(1, 99999),
                                            ),
-                            "Points per octave",
-                            )
+                          "Outlier fence (IQR)",
+                          )
 
+        user_form.add_row(pwi.ComboBox("outlier_action",
+                                       "Action to carry out on curves that fall partly or fully outside the fence.",
+                                       [("None",),
+                                        ("Hide",),
+                                        ("Remove",),
+                                        ]
+                                       ),
+                          "Action on outliers",
+                          )
+
+        return user_form
+
+    def _create_interpolation_form(self):
+        # ---- Interpolation page
+        user_form = pwi.UserForm()
+
+        user_form.add_row(pwi.IntSpinBox("processing_interpolation_ppo",
+                                         None,
+                                         min_max=(1, 99999),
+                                         ),
+                          "Points per octave",
+                          )
+
+        return user_form
+
+    def _create_best_fit_form(self):
         # ---- Show best fits
-        user_form_4 = pwi.UserForm()
-        # tab page is the UserForm widget
-        self.tab_widget.addTab(user_form_4, "Best fit to current")
-        i = self.tab_widget.indexOf(user_form_4)
-        self.user_forms_and_recipient_functions[i] = (
-            user_form_4, "_show_best_fits")
-
-        user_form_4.add_row(pwi.IntSpinBox("best_fit_calculation_resolution_ppo",
-                                           "How many calculation points per octave to use for the calculation"
-                                           " of the differences between the reference curve and the candidates."),
-                            "Resolution (ppo)",
-                            )
-
-        user_form_4.add_row(pwi.IntSpinBox("best_fit_critical_range_start_freq",
-                                           "Start frequency for range where weighing will be applied."),
-                            "Critical range start (Hz)",
-                            )
-
-        user_form_4.add_row(pwi.IntSpinBox("best_fit_critical_range_end_freq",
-                                           "End frequency for range where weighing will be applied."),
-                            "Critical range end (Hz)",
-                            )
-
-        user_form_4.add_row(pwi.IntSpinBox("best_fit_critical_range_weight",
-                                           "Multiplier to increase the weighting of the selected frequency range."
-                                           "Setting to 1 means there will be no weighting."
-                                           "Setting to 0 means the range will not be considered in the calculation"),
-                            "Critical range weight",
-                            )
+        user_form = pwi.UserForm()
 
-        # ---- Common buttons for the dialog
-        button_group = pwi.PushButtonGroup({"run": "Run",
-                                            "cancel": "Cancel",
-                                            },
-                                           {},
-                                           )
-        button_group.buttons()["run_pushbutton"].setDefault(True)
-        layout.addWidget(button_group)
+        user_form.add_row(pwi.IntSpinBox("best_fit_calculation_resolution_ppo",
+                                         "How many calculation points per octave to use for the calculation"
+                                         " of the differences between the reference curve and the candidates."),
+                          "Resolution (ppo)",
+                          )
 
-        # ---- Update parameters from settings
-        self.tab_widget.setCurrentIndex(settings.processing_selected_tab)
-        for i in range(self.tab_widget.count()):
-            user_form = self.tab_widget.widget(i)
-            for key, widget in user_form.interactable_widgets.items():
-                saved_setting = getattr(settings, key)
-                if isinstance(widget, qtw.QCheckBox):
-                    widget.setChecked(saved_setting)
-                elif isinstance(widget, qtw.QComboBox):
-                    widget.setCurrentIndex(saved_setting)
-                else:
-                    widget.setValue(saved_setting)
+        user_form.add_row(pwi.IntSpinBox("best_fit_critical_range_start_freq",
+                                         "Start frequency for range where weighing will be applied."),
+                          "Critical range start (Hz)",
+                          )
 
-        # ---- Connections
-        button_group.buttons()["cancel_pushbutton"].clicked.connect(
-            self.reject)
-        button_group.buttons()["run_pushbutton"].clicked.connect(
-            self._save_and_close)
+        user_form.add_row(pwi.IntSpinBox("best_fit_critical_range_end_freq",
+                                         "End frequency for range where weighing will be applied."),
+                          "Critical range end (Hz)",
+                          )
+
+        user_form.add_row(pwi.IntSpinBox("best_fit_critical_range_weight",
+                                         "Multiplier to increase the weighting of the selected frequency range."
+                                         "Setting to 1 means there will be no weighting."
+                                         "Setting to 0 means the range will not be considered in the calculation"),
+                          "Critical range weight",
+                          )
+
+        return user_form
 
     def _save_and_close(self):
         active_tab_index = self.tab_widget.currentIndex()
-        user_form, processing_function_name = self.user_forms_and_recipient_functions[
-            active_tab_index]
-        settings.update("processing_selected_tab",
-                             self.tab_widget.currentIndex())
-
-        for key, widget in user_form.interactable_widgets.items():
-            if isinstance(widget, qtw.QCheckBox):
-                settings.update(key, widget.isChecked())
-            elif isinstance(widget, qtw.QComboBox):
-                settings.update(key, widget.currentIndex())
-            else:
-                settings.update(key, widget.value())
+        user_form = self._user_forms[active_tab_index]
+        processing_function = self._processing_functions[active_tab_index]
+        new_settings = read_widget_values(user_form.interactable_widgets)
+        new_settings["processing_selected_tab"] = active_tab_index
+
+        settings.update_many(new_settings)
 
         self.setWindowTitle("Calculating...")
         self.setEnabled(False)  # calculating
-        self.repaint()
-        self.signal_processing_request.emit(processing_function_name)
+        self.update()
+        # start the calculation from the event loop so the disabled dialog is painted first
+        qtc.QTimer.singleShot(0, partial(self._request_processing, processing_function))
+
+    def _request_processing(self, processing_function):
+        self.signal_processing_request.emit(processing_function)
         self.accept()
 
 
@@ -1550,13 +1918,9 @@ class ImportDialog(qtw.QDialog):
         layout.addWidget(button_group)
 
         # read values from settings
-        values_new = {}
-        for key, widget in user_form.interactable_widgets.items():
-            if isinstance(widget, qtw.QComboBox):
-                values_new[key] = {"current_index": getattr(settings, key)}
-            else:
-                values_new[key] = getattr(settings, key)
-        user_form.update_form_values(values_new)
+        load_widget_values(user_form.interactable_widgets,
+                           settings.snapshot(user_form.interactable_widgets.keys()),
+                           )
 
         # Connections
         button_group.buttons()["close_pushbutton"].clicked.connect(self.reject)
@@ -1565,25 +1929,28 @@ class ImportDialog(qtw.QDialog):
         button_group.buttons()["read_clipboard_pushbutton"].clicked.connect(
             partial(self._import_requested, "clipboard", user_form))
 
-    def _save_form_values_to_settings(self, user_form: pwi.UserForm):
-        values = user_form.get_form_values()
+    def _save_form_values_to_settings(self, values: dict):
+        new_settings = {}
         for widget_name, value in values.items():
             if isinstance(value, dict) and "current_index" in value.keys():
-                settings.update(widget_name, value["current_index"])
+                new_settings[widget_name] = value["current_index"]
             else:
-                settings.update(widget_name, value)
+                new_settings[widget_name] = value
+        settings.update_many(new_settings)
 
     @qtc.Slot()
     def deactivate(self):
         self.setWindowTitle("Importing...")
         self.setEnabled(False)
-        self.repaint()
+        self.update()
+        # import runs right after this in the GUI thread. paint the disabled dialog before it starts.
+        qtc.QCoreApplication.processEvents(qtc.QEventLoop.ExcludeUserInputEvents)
 
     @qtc.Slot()
     def reactivate(self):
         self.setWindowTitle("Import table with curve(s)")
         self.setEnabled(True)
-        self.repaint()
+        self.update()
 
     def _import_requested(self, source, user_form: pwi.UserForm):
         # Pass to easier names
@@ -1602,17 +1969,20 @@ class ImportDialog(qtw.QDialog):
         decimal_separator = form_values["import_table_decimal_separator"]["items"][decimal_separator_current_index][1]
 
         # Do validations
+        errors = []
         if decimal_separator == delimiter:
-            raise ValueError("Cannot have the same character for delimiter and decimal separator.")
-        elif layout_type == 0 and no_header == 0:
-            raise ValueError("Header line cannot be zero. Since you have selected"
-                             " headers as frequencies, there needs to be a line for headers.")
-        elif layout_type == 1 and no_index == 0:
-            raise ValueError("Index column cannot be zero. Since you have selected"
-                             " indexes as frequencies, there needs to be a column for indexes.")
-        else:
-            # Validations passed. Save settings.
-            self._save_form_values_to_settings(user_form)
+            errors.append("Cannot have the same character for delimiter and decimal separator.")
+        if layout_type == 0 and no_header == 0:
+            errors.append("Header line cannot be zero. Since you have selected"
+                          " headers as frequencies, there needs to be a line for headers.")
+        if layout_type == 1 and no_index == 0:
+            errors.append("Index column cannot be zero. Since you have selected"
+                          " indexes as frequencies, there needs to be a column for indexes.")
+        if errors:
+            raise ValueError("\n".join(errors))
+
+        # Validations passed. Save settings.
+        self._save_form_values_to_settings(form_values)
 
         user_settings = {}
         for key in ["no_header", "no_index", "layout_type", "delimiter", "decimal_separator"]:
@@ -1620,7 +1990,7 @@ class ImportDialog(qtw.QDialog):
 
         try:
             self.signal_import_table_request.emit(source, user_settings)
-        except:
+        except Exception:
             self.signal_table_import_fail.emit()
 
 
@@ -1643,8 +2013,7 @@ class SettingsDialog(qtw.QDialog):
         user_form.add_row(pwi.IntSpinBox("max_legend_size", "Limit the items that can be listed on the legend. Does not affect the shown curves in graph"),
                           "Nmax for graph legend")
 
-        mpl_styles = [
-            style_name for style_name in mpl.style.available if style_name[0] != "_"]
+        mpl_styles = get_matplotlib_styles()
         user_form.add_row(pwi.ComboBox("matplotlib_style",
                                        "Style for the canvas. To see options, web search: 'matplotlib style sheets reference'",
                                        [(style_name, style_name)
@@ -1691,6 +2060,12 @@ class SettingsDialog(qtw.QDialog):
                           "Interpolate must contain frequency (Hz)",
                           )
 
+        user_form.add_row(pwi.CheckBox("save_state_fp32",
+                                       "Store curve values in single precision (float32) when saving state to a file."
+                                       "\nFrequencies are always stored in full precision."
+                                       "\nMakes the file smaller. Precision is more than enough for display but not lossless."),
+                          "Save state in single precision")
+
         user_form.add_row(pwi.SunkenLine())
 
         user_form.add_row(pwi.FloatSpinBox("A_beep",
@@ -1710,29 +2085,12 @@ class SettingsDialog(qtw.QDialog):
         layout.addWidget(button_group)
 
         # ---- read values from settings
-        for widget_name, widget in user_form.interactable_widgets.items():
-            saved_setting = getattr(settings, widget_name)
-            if isinstance(widget, qtw.QCheckBox):
-                widget.setChecked(saved_setting)
-
-            elif widget_name == "matplotlib_style":
-                try:
-                    index_from_settings = mpl_styles.index(saved_setting)
-                except IndexError:
-                    index_from_settings = 0
-                widget.setCurrentIndex(index_from_settings)
-
-            elif widget_name == "graph_grids":
-                try:
-                    index_from_settings = [widget.itemData(i) for i in range(
-                        widget.count())].index(settings.graph_grids)
-                except IndexError:
-                    index_from_settings = 0
-                widget.setCurrentIndex(index_from_settings)
-
-            else:
-                # print(widget_name, type(saved_setting), saved_setting)
-                widget.setValue(saved_setting)
+        saved_settings = settings.snapshot(user_form.interactable_widgets.keys())
+        # these combo boxes are stored in settings by their data, not by their index
+        for widget_name in ("matplotlib_style", "graph_grids"):
+            saved_settings[widget_name] = max(
+                user_form.interactable_widgets[widget_name].findData(saved_settings[widget_name]), 0)
+        load_widget_values(user_form.interactable_widgets, saved_settings)
 
         # Connections
         button_group.buttons()["cancel_pushbutton"].clicked.connect(
@@ -1741,8 +2099,7 @@ class SettingsDialog(qtw.QDialog):
             partial(self._save_and_close,  user_form.interactable_widgets, settings))
 
     def _save_and_close(self, user_input_widgets, settings):
-        mpl_styles = [
-            style_name for style_name in mpl.style.available if style_name[0] != "_"]
+        mpl_styles = get_matplotlib_styles()
         if user_input_widgets["matplotlib_style"].currentIndex() != mpl_styles.index(settings.matplotlib_style):
             message_box = qtw.QMessageBox(qtw.QMessageBox.Information,
                                           "Information",
@@ -1754,37 +2111,90 @@ class SettingsDialog(qtw.QDialog):
             if returned == qtw.QMessageBox.Cancel:
                 return
 
-        for widget_name, widget in user_input_widgets.items():
-            if isinstance(widget, qtw.QCheckBox):
-                settings.update(widget_name, widget.isChecked())
-            elif widget_name == "matplotlib_style":
-                settings.update(widget_name, widget.currentData())
-            elif widget_name == "graph_grids":
-                settings.update(widget_name, widget.currentData())
-            else:
-                settings.update(widget_name, widget.value())
+        new_settings = read_widget_values(user_input_widgets)
+        for widget_name in ("matplotlib_style", "graph_grids"):
+            new_settings[widget_name] = user_input_widgets[widget_name].currentData()
+        settings.update_many(new_settings)
         self.signal_settings_changed.emit()
         self.accept()
 
 
-class AutoImporter(qtc.QThread):
+class ClipboardParser(qtc.QObject):
+    """Parses clipboard text into curves. Lives in the auto importer's worker thread."""
+    signal_parse = qtc.Signal(str)
+    signal_new_import = qtc.Signal(signal_tools.Curve)
+
+    def __init__(self):
+        super().__init__()
+        self._last_text = None  # last clipboard text that was processed
+        self._poll_timer = qtc.QTimer(self)  # child object, moves to the worker thread together with self
+        self._poll_timer.setInterval(1000)
+        self._poll_timer.timeout.connect(self._poll)
+        self.signal_parse.connect(self._parse)
+
+    @qtc.Slot()
+    def start_polling(self):
+        self._poll_timer.start()
+
+    @qtc.Slot()
+    def _poll(self):
+        try:
+            import pyperclip
+            self._parse(pyperclip.paste())
+        except Exception:
+            logger.debug("Clipboard could not be read.")
+
+    @qtc.Slot(str)
+    def _parse(self, cb_data):
+        try:
+            # print("\nClipboard read:" + "\n" + str(type(cb_data)) + "\n" + cb_data)
+
+            # skip parsing when the same text is put on the clipboard again
+            if cb_data == self._last_text:
+                return
+            self._last_text = cb_data
+
+            new_curve = signal_tools.Curve(cb_data)
+            if new_curve.is_curve():
+                self.signal_new_import.emit(new_curve)
+        except Exception:
+            # clipboard holds something other than a curve. common while auto import is on.
+            # runs for every copy in any application, so never let it reach the error dialog.
+            logger.debug("Clipboard content could not be parsed as a curve.")
+
+
+class AutoImporter(qtc.QObject):
     signal_new_import = qtc.Signal(signal_tools.Curve)
 
     def __init__(self, parent=None):
         super().__init__(parent=parent)
+        self._clipboard = qtw.QApplication.clipboard()
+        self._parser = ClipboardParser()
+        self._parser.signal_new_import.connect(self.signal_new_import)
+        self._parser_thread = qtc.QThread()
+        self._parser.moveToThread(self._parser_thread)
+
+        # on macOS and Wayland, QClipboard.dataChanged is not emitted for copies made in other applications
+        # while this one is in the background. poll the clipboard from the worker thread instead there.
+        self._use_polling = sys.platform == "darwin" or qtg.QGuiApplication.platformName().startswith("wayland")
+        if self._use_polling:
+            self._parser_thread.started.connect(self._parser.start_polling)
+
+    def start(self):
+        self._parser_thread.start()
+        if not self._use_polling:
+            self._clipboard.dataChanged.connect(self._clipboard_changed)
+
+    def stop(self):
+        if not self._use_polling:
+            self._clipboard.dataChanged.disconnect(self._clipboard_changed)
+        self._parser_thread.quit()
+        self._parser_thread.wait()
 
-    def run(self):
-        while not self.isInterruptionRequested():
-            try:
-                cb_data = pyperclip.waitForNewPaste(1)
-                # print("\nClipboard read:" + "\n" + str(type(cb_data)) + "\n" + cb_data)
-                new_curve = signal_tools.Curve(cb_data)
-                if new_curve.is_curve():
-                    self.signal_new_import.emit(new_curve)
-            except pyperclip.PyperclipTimeoutException:
-                pass
-            except Exception as e:
-                logger.warning(e)
+    @qtc.Slot()
+    def _clipboard_changed(self):
+        # clipboard can only be read in the GUI thread. parsing is queued to the worker thread.
+        self._parser.signal_parse.emit(self._clipboard.text())
 
 
 def parse_args(app_definitions):
@@ -1814,22 +2224,36 @@ def create_sound_engine(app):
     sound_engine = pwi.SoundEngine(settings)
     sound_engine_thread = qtc.QThread()
     sound_engine.moveToThread(sound_engine_thread)
-    sound_engine_thread.start(qtc.QThread.HighPriority)
+    # beeps are short UI cues. normal priority is enough and does not compete with the GUI thread.
+    sound_engine_thread.start()
 
     # ---- Connect
     app.aboutToQuit.connect(sound_engine.release_all)
     app.aboutToQuit.connect(sound_engine_thread.exit)
+    app.aboutToQuit.connect(sound_engine_thread.wait)
 
     return sound_engine, sound_engine_thread
 
 
 def setup_logging(args):
+    global log_listener
     if args.debuglevel:
         log_level = getattr(logging, args.debuglevel.upper())
     else:
         log_level = logging.INFO
     log_filename = Path.home().joinpath(f".{app_definitions['app_name'].lower()}.log")
-    logging.basicConfig(filename=log_filename,
+
+    # logging calls only put the records in a queue. writing to file happens in the listener's thread.
+    log_queue = queue.SimpleQueue()
+    file_handler = logging.handlers.RotatingFileHandler(filename=log_filename,
+                                                        maxBytes=1_048_576,
+                                                        backupCount=2,
+                                                        delay=True,
+                                                        encoding="utf-8",
+                                                        )
+    log_listener = logging.handlers.QueueListener(log_queue, file_handler)
+    log_listener.start()
+    logging.basicConfig(handlers=[logging.handlers.QueueHandler(log_queue)],
                         level=log_level,
                         force=True,
                         )
@@ -1846,7 +2270,6 @@ def main():
 
     args = parse_args(app_definitions)
     logger = setup_logging(args)
-    settings = Settings(app_definitions["app_name"])
 
     # ---- Create QApplication
     if not (app := qtw.QApplication.instance()):
@@ -1855,6 +2278,10 @@ def main():
         # app.setQuitOnLastWindowClosed(True)  # is this necessary??
         app.setWindowIcon(qtg.QIcon(app_definitions["icon_path"]))
 
+    # ---- Create settings. needs the QApplication for its write timer.
+    settings = Settings(app_definitions["app_name"])
+    app.aboutToQuit.connect(settings.close)  # write the changes still waiting and stop the writer thread
+
     # ---- Catch exceptions and handle with pop-up widget
     error_handler = pwi.ErrorHandlerUser(app, logger)
     sys.excepthook = error_handler.excepthook
@@ -1876,6 +2303,9 @@ def main():
     mw.show()
     app.exec()
 
+    # ---- Write the remaining log records, including the ones from shutdown
+    log_listener.stop()
+
 
 if __name__ == "__main__":
     main()